@@ -0,0 +1,238 @@
+"""
+Headless batch runner: optimize many boards described in JSON/YAML files on a pool of worker processes.
+
+Usage:
+    python Batch_runner.py boards/*.json -o results -j 4 --time-limit 1800 --memory-limit 4096
+
+Board file format (JSON, or YAML if PyYAML is installed):
+{
+    "name": "board_a",
+    "width": 50, "height": 50,
+    "components": [
+        {"id": "C1", "shape": "rect", "size_x": 20, "size_y": 10, "temp_gradient_params": [100, 15],
+         "pins": [{"id": "P1", "relative_x": -5, "relative_y": 0}, {"id": "P2", "relative_x": 5, "relative_y": 0}]},
+        ...
+    ],
+    "links": [[["C1", "P2"], ["C2", "P3"]], ...],
+    "ga": {"number_of_generations": 50, "population_size": 100, "reference_point": [200, 2500, 150], ...},  # keyword arguments of run_nsga2
+    "seeding": {"layouts": "board_a_rev1_pareto.pcbl", "position_sigma": 0.5, ...}  # optional warm start, see below
+}
+
+Set "reference_point" in "ga" to get hypervolumes comparable across boards, seeds and warm-started runs.
+With "seeding", run_nsga2 builds the initial population with generate_seeded_population from the layouts of a file
+written by Layout_io (path relative to the board file); the other keys are its keyword arguments.
+
+For every board, <name>_pareto.pcbl (layouts and objectives of the Pareto front, see Layout_io) and <name>_metrics.json
+(status, runtime, hypervolume history) are written in the output directory, plus a summary.json for the whole batch
+with the output paths of every job. Boards sharing a name get the job index appended (<name>_<index>_pareto.pcbl).
+No plotting library is imported, so it runs on machines without any matplotlib backend.
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import time
+import traceback
+import numpy as np
+
+from PCB_class import PCB
+from NSGA_II_implementation import run_nsga2, get_pareto_front
+from Layout_io import save_population, load_population
+
+
+def _read_definition(path: str):
+    with open(path) as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("reading YAML board files requires PyYAML") from e
+            definition = yaml.safe_load(f)
+        else:
+            definition = json.load(f)
+
+    return definition
+
+
+def board_name(path: str):
+    """Name of the board defined in a file ("name" key, or the file name without extension)"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    try:
+        return _read_definition(path).get("name", stem)
+    except Exception:
+        # unreadable files fail later in their own job
+        return stem
+
+
+def output_names(board_paths: list):
+    """Output name of each job: the board name, with the job index appended when several jobs share it"""
+    names = [board_name(path) for path in board_paths]
+    unique = []
+
+    for i, name in enumerate(names):
+        out = f"{name}_{i}" if names.count(name) > 1 else name
+        # a generated name can still clash with another board literally named like it
+        while out in unique:
+            out = f"{out}_{i}"
+        unique.append(out)
+
+    return unique
+
+
+def load_board_definition(path: str):
+    """Read a board file and return (name, pcb, ga_params, seeding)"""
+    definition = _read_definition(path)
+
+    name = definition.get("name", os.path.splitext(os.path.basename(path))[0])
+
+    pcb = PCB.from_dict(definition)
+
+    seeding = dict(definition.get("seeding") or {})
+    if "layouts" in seeding:
+        seeding["layouts"] = os.path.join(os.path.dirname(os.path.abspath(path)), seeding["layouts"])
+
+    return name, pcb, definition.get("ga", {}), seeding
+
+
+def _set_memory_limit(memory_limit_mb: float):
+    """Cap the address space of the current process (Unix only)"""
+    try:
+        import resource
+    except ImportError:
+        return
+
+    limit = int(memory_limit_mb * 1024 * 1024)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def run_job(path: str, output_dir: str, time_limit: float = None, memory_limit_mb: float = None, seed: int = None, output_name: str = None):
+    """
+    Optimize one board and write <output_name>_pareto.pcbl and <output_name>_metrics.json (output_name defaults
+    to the board name). Executed inside a worker process.
+    """
+    if memory_limit_mb is not None:
+        _set_memory_limit(memory_limit_mb)
+
+    output_name = output_name or board_name(path)
+    pareto_path = os.path.join(output_dir, f"{output_name}_pareto.pcbl")
+    metrics_path = os.path.join(output_dir, f"{output_name}_metrics.json")
+
+    metrics = {"board": path, "name": os.path.splitext(os.path.basename(path))[0], "pareto": None, "metrics": metrics_path}
+    start = time.monotonic()
+
+    try:
+        name, pcb, ga_params, seeding = load_board_definition(path)
+        metrics["name"] = name
+
+        seed_layouts = None
+        if seeding:
+            seed_layouts, _ = load_population(seeding.pop("layouts"))
+
+        pop, pop_objectives, archive, stop_reason = run_nsga2(
+            pcb, time_limit=time_limit, seed_layouts=seed_layouts, seeding=seeding, rng=seed, **ga_params
+        )
+        pareto_pop, pareto_objectives = get_pareto_front(pop, pop_objectives)
+
+        save_population(pareto_path, pareto_pop, np.array(pareto_objectives))
+        metrics["pareto"] = pareto_path
+
+        metrics.update({
+            "status": stop_reason,
+            "generations": len(archive.history),
+            "pareto_size": len(pareto_pop),
+            "hypervolume": archive.hypervolume,
+            "hypervolume_history": archive.history,
+            "reference_point": None if archive.reference_point is None else archive.reference_point.tolist(),
+        })
+
+    except MemoryError:
+        metrics["status"] = "memory_limit"
+
+    except Exception:
+        metrics["status"] = "error"
+        metrics["error"] = traceback.format_exc()
+
+    metrics["runtime"] = time.monotonic() - start
+
+    with open(metrics_path, "w") as f:
+        json.dump(metrics, f, indent=2)
+
+    return metrics
+
+
+def _worker(results: mp.Queue, i: int, *job_args):
+    metrics = run_job(*job_args)
+    results.put((i, {key: metrics[key] for key in ("board", "status", "runtime", "pareto", "metrics")}))
+
+
+def run_batch(board_paths: list, output_dir: str, n_workers: int = None, time_limit: float = None, memory_limit_mb: float = None, seed: int = None, grace_period: float = 60):
+    """
+    Optimize all the boards on a pool of n_workers processes, one process per job.
+    time_limit stops the GA loop gracefully between generations; a job still running grace_period seconds after time_limit is killed.
+    Boards sharing a name get the job index appended to their output files, so no job overwrites another.
+    Return the list of per-board summaries with their output paths (also written to output_dir/summary.json).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    n_workers = n_workers or os.cpu_count() or 1
+    names = output_names(board_paths)
+
+    pending = list(enumerate(board_paths))
+    running = {}
+    summary = [None] * len(board_paths)
+    results = mp.Queue()
+
+    while pending or running:
+
+        while pending and len(running) < n_workers:
+            i, path = pending.pop(0)
+            job_seed = None if seed is None else seed + i
+            process = mp.Process(target=_worker, args=(results, i, path, output_dir, time_limit, memory_limit_mb, job_seed, names[i]))
+            process.start()
+            running[i] = (process, path, time.monotonic())
+
+        while not results.empty():
+            i, entry = results.get()
+            summary[i] = entry
+
+        for i, (process, path, started) in list(running.items()):
+            elapsed = time.monotonic() - started
+
+            if process.is_alive():
+                if time_limit is not None and elapsed > time_limit + grace_period:
+                    process.terminate()
+                    process.join()
+                    summary[i] = {"board": path, "status": "killed", "runtime": elapsed, "pareto": None, "metrics": None}
+                    del running[i]
+                continue
+
+            process.join()
+            while not results.empty():
+                j, entry = results.get()
+                summary[j] = entry
+
+            if summary[i] is None:
+                # the worker died before reporting (e.g. killed by the memory limit)
+                summary[i] = {"board": path, "status": f"exit code {process.exitcode}", "runtime": elapsed, "pareto": None, "metrics": None}
+            del running[i]
+
+        time.sleep(0.1)
+
+    with open(os.path.join(output_dir, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+
+    return summary
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Optimize a batch of PCB layouts with NSGA-II, without plots.")
+    parser.add_argument("boards", nargs="+", help="board definition files (.json, .yaml)")
+    parser.add_argument("-o", "--output-dir", default="results")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="number of concurrent jobs (default: number of CPUs)")
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds per board")
+    parser.add_argument("--memory-limit", type=float, default=None, help="MB per board")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    for entry in run_batch(args.boards, args.output_dir, args.workers, args.time_limit, args.memory_limit, args.seed):
+        print(f"{entry['board']}: {entry['status']} ({entry['runtime']:.1f} s)")
@@ -36,6 +36,9 @@ class Component:
         self.rotation = rotation
         self.temp_gradient_params = temp_gradient_params
 
+        # True when the pose changed since the owning PCB last evaluated its objectives
+        self.dirty = True
+
         self.update_absolute_pin_position()
 
     def clone(self):
@@ -51,13 +54,42 @@ class Component:
             temp_gradient_params=self.temp_gradient_params
         )
     
+    def to_dict(self):
+        """Return the footprint of the component (everything but its pose) as a JSON-serializable dict."""
+        return {
+            "id": self.id,
+            "shape": self.shape,
+            "size_x": self.size_x,
+            "size_y": self.size_y,
+            "temp_gradient_params": None if self.temp_gradient_params is None else list(self.temp_gradient_params),
+            "pins": [{"id": p.id, "relative_x": p.relative_x, "relative_y": p.relative_y} for p in self.pins]
+        }
+
+    @staticmethod
+    def from_dict(d: dict):
+        """Build a component from a dict as returned by to_dict (position and rotation are optional)."""
+        return Component(
+            id=d["id"],
+            shape=d.get("shape", "rect"),
+            size_x=d["size_x"],
+            size_y=d["size_y"],
+            pins=[Pin(id=p["id"], relative_x=p["relative_x"], relative_y=p["relative_y"]) for p in d.get("pins", [])],
+            position=tuple(d.get("position", (0.0, 0.0))),
+            rotation=d.get("rotation", 0.0),
+            temp_gradient_params=None if d.get("temp_gradient_params") is None else tuple(d["temp_gradient_params"])
+        )
+
+    def circle_radius(self) -> float:
+        """Radius used when the component is a circle."""
+        return max(self.size_x, self.size_y) / 2
+
     def get_shape(self):
         """Return the Shapely geometry representing the component."""
 
         px, py = self.position
 
         if self.shape == "circle":
-            r = max(self.size_x, self.size_y) / 2
+            r = self.circle_radius()
             geom = Point(0, 0).buffer(r)  # centered at origin
 
         else: 
@@ -82,11 +114,13 @@ class Component:
     def rotate(self, angle: float):
         """Rotate the component by a given angle (degrees)"""
         self.rotation = (self.rotation + angle) % 360
+        self.dirty = True
         self.update_absolute_pin_position()
 
     def move(self, new_position: vec2D):
         """Move the component to a new position."""
         self.position = new_position
+        self.dirty = True
         self.update_absolute_pin_position()
 
     def get_position(self) -> vec2D:
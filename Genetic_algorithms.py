@@ -1,6 +1,10 @@
 import random
+import math
+import numpy as np
 
-from PCB_class import PCB
+from typing import Optional
+
+from PCB_class import PCB, PIN_DISTANCE_ALPHA, PIN_DISTANCE_BETA
 
 
 def generate_random_population(pcb_template: PCB, population_size: int):
@@ -43,6 +47,9 @@ def crossover(parent1: PCB, parent2: PCB, n: int, crossover_rate: float = 0.9):
         c2.rotation = rot1
         c2.update_absolute_pin_position()
 
+    child1.mark_dirty()
+    child2.mark_dirty()
+
     child1.resolve_conflicts()
     child2.resolve_conflicts()
 
@@ -55,6 +62,7 @@ def mutate_rotation(pcb: PCB, mutation_rate: float = 0.1):
         comp = random.choice(list(pcb.components.values()))
         angle = random.randint(0,359)
         comp.rotate(angle)
+        pcb.mark_dirty()
         pcb.resolve_conflicts()
 
 def mutate_position(pcb: PCB, mutation_rate: float = 0.1):
@@ -69,6 +77,7 @@ def mutate_position(pcb: PCB, mutation_rate: float = 0.1):
         x = random.uniform(comp_max_dim, pcb.width - comp_max_dim)
         y = random.uniform(comp_max_dim, pcb.height - comp_max_dim)
         comp.move((x, y))
+        pcb.mark_dirty()
         pcb.resolve_conflicts()
 
 def tournament_select(population, ranks, crowding):
@@ -84,4 +93,560 @@ def tournament_select(population, ranks, crowding):
     if crowding[i] > crowding[j]:
         return population[i]
     else:
-        return population[j]
\ No newline at end of file
+        return population[j]
+
+def _component_bounds(pcb_template: PCB):
+    """Return per-component sampling bounds (low, high) as (n_components, 3) arrays for [x, y, rotation]."""
+    sizes = np.array([[c.size_x, c.size_y] for c in pcb_template.components.values()], dtype=float)
+
+    low = np.zeros((len(sizes), 3))
+    high = np.zeros((len(sizes), 3))
+
+    low[:, :2] = sizes / 2
+    high[:, 0] = pcb_template.width - sizes[:, 0] / 2
+    high[:, 1] = pcb_template.height - sizes[:, 1] / 2
+    high[:, 2] = 360
+
+    return low, high
+
+
+def _bounding_radii(pcb_template: PCB):
+    """Radius of the circle enclosing each component whatever its rotation."""
+    return np.array([
+        c.circle_radius() if c.shape == "circle" else math.hypot(c.size_x, c.size_y) / 2
+        for c in pcb_template.components.values()
+    ])
+
+
+def _pairs_overlap(pcb_template: PCB, pos: np.ndarray, rot: np.ndarray, b: np.ndarray, i: np.ndarray, j: np.ndarray):
+    """
+    Exact overlap test of the component pairs (i, j) of the individuals b, given positions (n, C, 2) and rotations (n, C):
+    circle-circle by distance, rect-circle by closest point, rect-rect by separating axes
+    """
+    comps = list(pcb_template.components.values())
+    is_circle = np.array([c.shape == "circle" for c in comps])
+    half = np.array([[c.size_x / 2, c.size_y / 2] for c in comps])
+    radius = np.array([c.circle_radius() for c in comps])
+
+    ci, cj = is_circle[i], is_circle[j]
+    d = pos[b, j] - pos[b, i]
+    theta_i, theta_j = np.radians(rot[b, i]), np.radians(rot[b, j])
+
+    # local axes of each rectangle
+    u_i = np.stack([np.cos(theta_i), np.sin(theta_i)], axis=-1)
+    v_i = np.stack([-np.sin(theta_i), np.cos(theta_i)], axis=-1)
+    u_j = np.stack([np.cos(theta_j), np.sin(theta_j)], axis=-1)
+    v_j = np.stack([-np.sin(theta_j), np.cos(theta_j)], axis=-1)
+
+    overlap = np.zeros(len(b), dtype=bool)
+
+    both_circles = ci & cj
+    overlap[both_circles] = np.hypot(d[both_circles, 0], d[both_circles, 1]) < radius[i[both_circles]] + radius[j[both_circles]]
+
+    # rect-circle: distance from the circle centre to the closest point of the rectangle, in the rectangle frame
+    for rect_is_i, sel in ((True, ~ci & cj), (False, ci & ~cj)):
+        rect, circ = (i[sel], j[sel]) if rect_is_i else (j[sel], i[sel])
+        u, v = (u_i[sel], v_i[sel]) if rect_is_i else (u_j[sel], v_j[sel])
+        offset = d[sel] if rect_is_i else -d[sel]
+        local = np.stack([np.sum(offset * u, axis=1), np.sum(offset * v, axis=1)], axis=-1)
+        closest = np.clip(local, -half[rect], half[rect])
+        overlap[sel] = np.hypot(*(local - closest).T) < radius[circ]
+
+    # rect-rect: the rectangles overlap if no axis among their edges separates them
+    sel = ~ci & ~cj
+    separated = np.zeros(sel.sum(), dtype=bool)
+    hi, hj = half[i[sel]], half[j[sel]]
+    for axis in (u_i[sel], v_i[sel], u_j[sel], v_j[sel]):
+        reach_i = hi[:, 0] * np.abs(np.sum(u_i[sel] * axis, axis=1)) + hi[:, 1] * np.abs(np.sum(v_i[sel] * axis, axis=1))
+        reach_j = hj[:, 0] * np.abs(np.sum(u_j[sel] * axis, axis=1)) + hj[:, 1] * np.abs(np.sum(v_j[sel] * axis, axis=1))
+        separated |= np.abs(np.sum(d[sel] * axis, axis=1)) >= reach_i + reach_j
+    overlap[sel] = ~separated
+
+    return overlap
+
+
+def sample_random_genomes(pcb_template: PCB, population_size: int, rng=None, sampling: str = "uniform"):
+    """
+    Sample the poses of all individuals at once as a (population_size, n_components, 3) array of [x, y, rotation].
+    sampling can be "uniform", "lhs" (latin hypercube) or "sobol" (needs scipy) for a better coverage of the board.
+    """
+    rng = np.random.default_rng(rng)
+    low, high = _component_bounds(pcb_template)
+    n_dims = low.size
+
+    if sampling == "uniform":
+        u = rng.random((population_size, n_dims))
+
+    elif sampling == "lhs":
+        # one sample per stratum in every dimension, strata shuffled independently
+        strata = rng.permuted(np.tile(np.arange(population_size), (n_dims, 1)), axis=1).T
+        u = (strata + rng.random((population_size, n_dims))) / population_size
+
+    elif sampling == "sobol":
+        try:
+            from scipy.stats import qmc
+        except ImportError as e:
+            raise ImportError("sampling='sobol' requires scipy") from e
+
+        u = qmc.Sobol(d=n_dims, scramble=True, seed=rng).random(population_size)
+
+    else:
+        raise ValueError(f"Unknown sampling method: {sampling}")
+
+    u = u.reshape(population_size, *low.shape)
+
+    return low + u * (high - low)
+
+
+def legalize_genomes(pcb_template: PCB, genomes: np.ndarray, max_iterations: int = 50, rng=None, margin: float = 0.1, chunk_elements: int = 4_000_000):
+    """
+    Push overlapping components apart in all the genomes at once. Pairs whose bounding circles intersect are
+    confirmed with an exact test, so already legal layouts are left untouched. Return the legalized genomes and a boolean mask of the individuals that still have overlaps.
+    """
+    rng = np.random.default_rng(rng)
+    genomes = np.array(genomes, dtype=float)
+    n_individuals, n_components, _ = genomes.shape
+
+    radii = _bounding_radii(pcb_template)
+    min_dist = radii[:, None] + radii[None, :]
+    np.fill_diagonal(min_dist, 0)
+
+    low, high = _component_bounds(pcb_template)
+    unresolved = np.zeros(n_individuals, dtype=bool)
+
+    # process the population in chunks to bound the (chunk, C, C) pairwise arrays
+    chunk_size = max(1, chunk_elements // max(1, n_components * n_components))
+
+    for start in range(0, n_individuals, chunk_size):
+        pos = genomes[start:start + chunk_size, :, :2]
+        rot = genomes[start:start + chunk_size, :, 2]
+        active = np.arange(len(pos))
+
+        for _ in range(max_iterations):
+            p = pos[active]
+            dx = p[:, :, None, 0] - p[:, None, :, 0]
+            dy = p[:, :, None, 1] - p[:, None, :, 1]
+            dist = np.hypot(dx, dy)
+            overlap = np.clip(min_dist - dist, 0, None)
+
+            # keep only the candidate pairs that really overlap
+            b, i, j = np.nonzero(np.triu(overlap > 0))
+            real = _pairs_overlap(pcb_template, p, rot[active], b, i, j)
+            overlap[b[~real], i[~real], j[~real]] = 0
+            overlap[b[~real], j[~real], i[~real]] = 0
+
+            has_overlap = overlap.any(axis=(1, 2))
+            if not has_overlap.any():
+                active = active[:0]
+                break
+
+            # coincident centres get a random direction to avoid zero movement
+            b, i, j = np.nonzero((dist == 0) & (overlap > 0))
+            if len(b):
+                angles = rng.uniform(0, 2 * np.pi, len(b))
+                dx[b, i, j], dy[b, i, j] = np.cos(angles), np.sin(angles)
+                dx[b, j, i], dy[b, j, i] = -np.cos(angles), -np.sin(angles)
+                dist[b, i, j] = dist[b, j, i] = 1
+
+            # each component of an overlapping pair moves half of the overlap (plus a margin) away from the other
+            scale = np.where(overlap > 0, 0.5 * (overlap + margin), 0) / np.where(dist == 0, 1, dist)
+            p[:, :, 0] += (scale * dx).sum(axis=2)
+            p[:, :, 1] += (scale * dy).sum(axis=2)
+            p = np.clip(p, low[:, :2], high[:, :2])
+
+            pos[active] = p
+            active = active[has_overlap]
+
+        unresolved[start + active] = True
+
+    return genomes, unresolved
+
+
+def genomes_to_population(pcb_template: PCB, genomes: np.ndarray):
+    """Build one PCB per genome, cloning the template"""
+    population = []
+    for genome in genomes:
+        new_pcb = pcb_template.clone()
+        new_pcb.set_genome(genome)
+        population.append(new_pcb)
+
+    return population
+
+
+def legal_population_from_genomes(pcb_template: PCB, genomes: np.ndarray, rng=None, max_iterations: int = 50):
+    """
+    Legalize the genomes in bulk, build one PCB per genome and fall back to resolve_conflicts for the boards that
+    legalize_genomes could not fix. Return the population and the final genomes (including the fallback moves)
+    """
+    genomes, unresolved = legalize_genomes(pcb_template, genomes, max_iterations, rng)
+    population = genomes_to_population(pcb_template, genomes)
+
+    for i in np.flatnonzero(unresolved):
+        population[i].resolve_conflicts()
+        genomes[i] = population[i].get_genome()
+
+    return population, genomes
+
+
+def generate_random_population_batch(pcb_template: PCB, population_size: int, rng=None, sampling: str = "uniform", max_iterations: int = 50):
+    """
+    Batched version of generate_random_population: sample and legalize all individuals with NumPy,
+    then fall back to resolve_conflicts only for the boards where the bounding circles still overlap
+    """
+    rng = np.random.default_rng(rng)
+
+    genomes = sample_random_genomes(pcb_template, population_size, rng, sampling)
+    population, _ = legal_population_from_genomes(pcb_template, genomes, rng, max_iterations)
+
+    return population
+
+
+def generate_seeded_population(
+        pcb_template: PCB,
+        seeds: list,
+        population_size: int,
+        position_sigma: Optional[float] = None,
+        rotation_sigma: float = 5.0,
+        random_fraction: float = 0.0,
+        keep_seeds: bool = True,
+        rng=None,
+        sampling: str = "uniform"):
+    """
+    Warm-start population built from existing layouts (a previous design revision or a previous Pareto set).
+    Components found in a seed with the same footprint keep the seed pose plus gaussian noise (position_sigma,
+    default 1% of the board size, and rotation_sigma in degrees); new or changed components are placed randomly.
+    The first copy of each seed is not perturbed if keep_seeds, and random_fraction of the population is fully random.
+    """
+    if len(seeds) == 0:
+        raise ValueError("generate_seeded_population needs at least one seed layout")
+
+    rng = np.random.default_rng(rng)
+
+    if position_sigma is None:
+        position_sigma = 0.01 * max(pcb_template.width, pcb_template.height)
+
+    comp_ids = list(pcb_template.components.keys())
+    footprints = [pcb_template.components[cid].to_dict() for cid in comp_ids]
+
+    # poses of the seeds in template component order, and which of them can be reused
+    seed_genomes = np.zeros((len(seeds), len(comp_ids), 3))
+    reused = np.zeros((len(seeds), len(comp_ids)), dtype=bool)
+
+    for s, seed in enumerate(seeds):
+        for k, cid in enumerate(comp_ids):
+            comp = seed.components.get(cid)
+            if comp is not None and comp.to_dict() == footprints[k]:
+                seed_genomes[s, k] = [comp.position[0], comp.position[1], comp.rotation]
+                reused[s, k] = True
+
+    genomes = sample_random_genomes(pcb_template, population_size, rng, sampling)
+
+    n_seeded = population_size - int(round(random_fraction * population_size))
+    which = np.arange(n_seeded) % len(seeds)
+
+    noisy = seed_genomes[which].copy()
+    noisy[..., :2] += rng.normal(0, position_sigma, noisy[..., :2].shape)
+    noisy[..., 2] += rng.normal(0, rotation_sigma, noisy[..., 2].shape)
+
+    if keep_seeds:
+        n_exact = min(len(seeds), n_seeded)
+        noisy[:n_exact] = seed_genomes[:n_exact]
+
+    low, high = _component_bounds(pcb_template)
+    noisy[..., :2] = np.clip(noisy[..., :2], low[:, :2], high[:, :2])
+    noisy[..., 2] %= 360
+
+    genomes[:n_seeded] = np.where(reused[which][..., None], noisy, genomes[:n_seeded])
+
+    population, _ = legal_population_from_genomes(pcb_template, genomes, rng)
+
+    return population
+
+
+def tournament_select_batch(ranks, crowding, n_select: int, rng=None):
+    """Batched tournament_select: return the indices of n_select winners of binary tournaments (rank first, then crowding distance)"""
+    rng = np.random.default_rng(rng)
+    ranks = np.asarray(ranks)
+    crowding = np.asarray(crowding, dtype=float)
+
+    # two distinct contestants per tournament
+    i = rng.integers(0, len(ranks), n_select)
+    j = (i + rng.integers(1, len(ranks), n_select)) % len(ranks)
+
+    i_wins = (ranks[i] < ranks[j]) | ((ranks[i] == ranks[j]) & (crowding[i] > crowding[j]))
+
+    return np.where(i_wins, i, j)
+
+
+def crossover_batch(parents1: np.ndarray, parents2: np.ndarray, n: int = 1, crossover_rate: float = 0.9, method: str = "swap", rng=None):
+    """
+    Batched crossover over (n_pairs, n_components, 3) parent genomes.
+    method is "swap" (swap n random components, as crossover), "uniform" (swap each component with probability 0.5)
+    or "npoint" (swap the components between n random cut points). Pairs are crossed with probability crossover_rate.
+    """
+    rng = np.random.default_rng(rng)
+    n_pairs, n_components, _ = parents1.shape
+
+    if method == "swap":
+        # n distinct components per pair: the n smallest of random keys
+        keys = rng.random((n_pairs, n_components))
+        chosen = np.argsort(keys, axis=1)[:, :n]
+        mask = np.zeros((n_pairs, n_components), dtype=bool)
+        np.put_along_axis(mask, chosen, True, axis=1)
+
+    elif method == "uniform":
+        mask = rng.random((n_pairs, n_components)) < 0.5
+
+    elif method == "npoint":
+        cuts = np.sort(rng.integers(1, n_components, (n_pairs, n)), axis=1)
+        # number of cut points before each component, odd segments are swapped
+        segment = (np.arange(n_components)[None, :, None] >= cuts[:, None, :]).sum(axis=2)
+        mask = segment % 2 == 1
+
+    else:
+        raise ValueError(f"Unknown crossover method: {method}")
+
+    mask &= (rng.random(n_pairs) < crossover_rate)[:, None]
+
+    children1 = np.where(mask[..., None], parents2, parents1)
+    children2 = np.where(mask[..., None], parents1, parents2)
+
+    return children1, children2
+
+
+def _mutation_mask(n_individuals: int, n_components: int, mutation_rate: float, rng):
+    """One random component for each individual mutated with probability mutation_rate (as the scalar operators)"""
+    mask = np.zeros((n_individuals, n_components), dtype=bool)
+    mutated = np.flatnonzero(rng.random(n_individuals) < mutation_rate)
+    mask[mutated, rng.integers(0, n_components, len(mutated))] = True
+
+    return mask
+
+
+def mutate_rotation_batch(genomes: np.ndarray, mutation_rate: float = 0.1, sigma: Optional[float] = None, rng=None):
+    """
+    Batched mutate_rotation: rotate one random component of each mutated individual,
+    by a uniform angle in [0, 360) or, if sigma is given, by a gaussian angle of std sigma (degrees)
+    """
+    rng = np.random.default_rng(rng)
+    genomes = genomes.copy()
+    mask = _mutation_mask(genomes.shape[0], genomes.shape[1], mutation_rate, rng)
+
+    if sigma is None:
+        noise = rng.integers(0, 360, mask.shape)
+    else:
+        noise = rng.normal(0, sigma, mask.shape)
+
+    genomes[..., 2] = np.where(mask, (genomes[..., 2] + noise) % 360, genomes[..., 2])
+
+    return genomes
+
+
+def mutate_position_batch(pcb_template: PCB, genomes: np.ndarray, mutation_rate: float = 0.1, sigma: Optional[float] = None, rng=None):
+    """
+    Batched mutate_position: move one random component of each mutated individual,
+    to a uniform random position or, if sigma is given, by a gaussian step of std sigma (clipped to the board)
+    """
+    rng = np.random.default_rng(rng)
+    genomes = genomes.copy()
+    mask = _mutation_mask(genomes.shape[0], genomes.shape[1], mutation_rate, rng)
+
+    # to avoid problems with out-of-bound placements
+    max_dim = np.array([max(c.size_x, c.size_y) for c in pcb_template.components.values()])
+    low = np.stack([max_dim, max_dim], axis=-1)
+    high = np.stack([pcb_template.width - max_dim, pcb_template.height - max_dim], axis=-1)
+
+    if sigma is None:
+        new_pos = rng.uniform(low, high, genomes[..., :2].shape)
+    else:
+        new_pos = np.clip(genomes[..., :2] + rng.normal(0, sigma, genomes[..., :2].shape), low, high)
+
+    genomes[..., :2] = np.where(mask[..., None], new_pos, genomes[..., :2])
+
+    return genomes
+
+
+def generate_offspring_batch(
+        pcb_template: PCB,
+        population: list,
+        ranks,
+        crowding,
+        n_offspring: int,
+        n_cross: int = 1,
+        crossover_rate: float = 0.9,
+        crossover_method: str = "swap",
+        rotation_mutation_rate: float = 0.1,
+        position_mutation_rate: float = 0.1,
+        rotation_sigma: Optional[float] = None,
+        position_sigma: Optional[float] = None,
+        rng=None,
+        return_genomes: bool = False):
+    """
+    Produce n_offspring children with the batched operators: tournament selection, crossover, rotation and position mutation,
+    legalization. Return the offspring PCBs (and the offspring genome matrix if return_genomes)
+    """
+    rng = np.random.default_rng(rng)
+    genomes = np.stack([pcb.get_genome() for pcb in population])
+
+    n_pairs = (n_offspring + 1) // 2
+    index1 = tournament_select_batch(ranks, crowding, n_pairs, rng)
+    index2 = tournament_select_batch(ranks, crowding, n_pairs, rng)
+
+    children1, children2 = crossover_batch(genomes[index1], genomes[index2], n_cross, crossover_rate, crossover_method, rng)
+    offspring_genomes = np.concatenate([children1, children2])[:n_offspring]
+    parent_index = np.concatenate([index1, index2])[:n_offspring]
+
+    offspring_genomes = mutate_rotation_batch(offspring_genomes, rotation_mutation_rate, rotation_sigma, rng)
+    offspring_genomes = mutate_position_batch(pcb_template, offspring_genomes, position_mutation_rate, position_sigma, rng)
+
+    # children equal to their parent (no crossover, no mutation) are plain clones: no legalization, cached objectives kept
+    changed = np.any(offspring_genomes != genomes[parent_index], axis=(1, 2))
+
+    changed_offspring, offspring_genomes[changed] = legal_population_from_genomes(pcb_template, offspring_genomes[changed], rng)
+    changed_offspring = iter(changed_offspring)
+
+    offspring = [next(changed_offspring) if changed[i] else population[parent_index[i]].clone() for i in range(n_offspring)]
+
+    if return_genomes:
+        return offspring, offspring_genomes
+
+    return offspring
+
+
+def evaluate_genomes(pcb_template: PCB, genomes: np.ndarray, resolution: int = 100, chunk_elements: int = 8_000_000):
+    """
+    Vectorized evaluate_objectives over (n, n_components, 3) genomes: return an (n, 3) array of
+    [max_temp, occupied_area, pin_distance], computed as in PCB (circles bounds are taken as exact circles)
+    """
+    genomes = np.asarray(genomes, dtype=float)
+    comps = list(pcb_template.components.values())
+    index = {cid: k for k, cid in enumerate(pcb_template.components)}
+
+    x, y = genomes[..., 0], genomes[..., 1]
+    theta = np.radians(genomes[..., 2])
+    cos, sin = np.cos(theta), np.sin(theta)
+
+    # occupied area: bounding box of the rotated shapes
+    is_circle = np.array([c.shape == "circle" for c in comps])
+    hx = np.array([c.circle_radius() if c.shape == "circle" else c.size_x / 2 for c in comps])
+    hy = np.array([c.circle_radius() if c.shape == "circle" else c.size_y / 2 for c in comps])
+    ex = np.where(is_circle, hx, np.abs(cos) * hx + np.abs(sin) * hy)
+    ey = np.where(is_circle, hy, np.abs(sin) * hx + np.abs(cos) * hy)
+    occupied_area = ((x + ex).max(axis=1) - (x - ex).min(axis=1)) * ((y + ey).max(axis=1) - (y - ey).min(axis=1))
+
+    # pin distance: absolute position of both ends of every link
+    pin_distance = np.zeros(len(genomes))
+    if pcb_template.links:
+        ends = []
+        for side in (0, 1):
+            ci = np.array([index[link[side][0]] for link in pcb_template.links])
+            pins = [pcb_template.get_pin(*link[side]) for link in pcb_template.links]
+            rx = np.array([p.relative_x for p in pins])
+            ry = np.array([p.relative_y for p in pins])
+            ends.append((
+                x[:, ci] + rx * cos[:, ci] - ry * sin[:, ci],
+                y[:, ci] + rx * sin[:, ci] + ry * cos[:, ci]
+            ))
+        dx = ends[0][0] - ends[1][0]
+        dy = ends[0][1] - ends[1][1]
+        pin_distance = (PIN_DISTANCE_ALPHA * np.hypot(dx, dy) + PIN_DISTANCE_BETA * (np.abs(dx) + np.abs(dy))).sum(axis=1)
+
+    # max temperature on the same resolution x resolution grid as PCB.calculate_max_temp
+    max_temp = np.zeros(len(genomes))
+    heat = np.array([c.temp_gradient_params is not None for c in comps])
+    if heat.any():
+        params = np.array([c.temp_gradient_params for c in comps if c.temp_gradient_params is not None], dtype=float)
+        X, Y = np.meshgrid(np.linspace(0, pcb_template.width, resolution), np.linspace(0, pcb_template.height, resolution))
+        X, Y = X.ravel(), Y.ravel()
+
+        chunk_size = max(1, chunk_elements // (int(heat.sum()) * X.size))
+        for start in range(0, len(genomes), chunk_size):
+            cx = x[start:start + chunk_size, heat][..., None]
+            cy = y[start:start + chunk_size, heat][..., None]
+            r = np.hypot(X - cx, Y - cy)
+            T = (params[:, 0, None] * np.exp(-r / params[:, 1, None])).sum(axis=1)
+            max_temp[start:start + chunk_size] = T.max(axis=1)
+
+    return np.stack([max_temp, occupied_area, pin_distance], axis=1)
+
+
+def local_search_batch(
+        pcb_template: PCB,
+        genomes: np.ndarray,
+        budget: int = 1000,
+        n_candidates: int = 8,
+        step: Optional[float] = None,
+        min_step: Optional[float] = None,
+        rng=None):
+    """
+    Gradient-free local search on (n, n_components, 3) genomes (e.g. the Pareto front) with vectorized objectives.
+    Each round, every refined individual tries n_candidates moves of one random component by a gaussian step;
+    the best candidate that dominates the current layout and does not overlap is accepted. The step grows on success
+    and halves on failure, and an individual is dropped when it falls below min_step.
+    The budget (number of candidate evaluations) goes first to the individuals whose last move improved the most.
+    Return the refined genomes, their (vectorized) objectives and the number of evaluations used.
+    """
+    rng = np.random.default_rng(rng)
+    genomes = np.array(genomes, dtype=float)
+    n_individuals, n_components, _ = genomes.shape
+
+    if step is None:
+        step = 0.02 * max(pcb_template.width, pcb_template.height)
+    if min_step is None:
+        min_step = step / 64
+
+    objectives = evaluate_genomes(pcb_template, genomes)
+    scale = np.ptp(objectives, axis=0)
+    scale[scale == 0] = 1
+
+    low, high = _component_bounds(pcb_template)
+    radii = _bounding_radii(pcb_template)
+    min_dist = radii[:, None] + radii[None, :]
+
+    steps = np.full(n_individuals, step)
+    gains = np.full(n_individuals, np.inf)
+    evaluations = 0
+
+    while True:
+        active = np.flatnonzero(steps >= min_step)
+        n_fit = min(len(active), (budget - evaluations) // n_candidates)
+        if n_fit == 0:
+            break
+
+        # individuals improving the fastest first
+        active = active[np.argsort(-gains[active], kind="stable")[:n_fit]]
+
+        owner = np.repeat(active, n_candidates)
+        moved = rng.integers(0, n_components, len(owner))
+        rows = np.arange(len(owner))
+
+        candidates = genomes[owner]
+        candidates[rows, moved, :2] += rng.normal(0, 1, (len(owner), 2)) * steps[owner, None]
+        candidates[rows, moved, :2] = np.clip(candidates[rows, moved, :2], low[moved, :2], high[moved, :2])
+
+        # overlap penalty: candidates where the moved component overlaps another one are rejected
+        dist = np.hypot(*(candidates[..., :2] - candidates[rows, moved, None, :2]).transpose(2, 0, 1))
+        close = dist < min_dist[moved]
+        close[rows, moved] = False
+        b, j = np.nonzero(close)
+        overlapping = np.zeros(len(owner), dtype=bool)
+        overlapping[b[_pairs_overlap(pcb_template, candidates[..., :2], candidates[..., 2], b, moved[b], j)]] = True
+
+        candidate_objectives = evaluate_genomes(pcb_template, candidates)
+        evaluations += len(owner)
+
+        current = objectives[owner]
+        improving = np.all(candidate_objectives <= current, axis=1) & np.any(candidate_objectives < current, axis=1) & ~overlapping
+        gain = np.where(improving, ((current - candidate_objectives) / scale).sum(axis=1), -np.inf).reshape(len(active), n_candidates)
+
+        best = np.argmax(gain, axis=1)
+        success = np.isfinite(gain[np.arange(len(active)), best])
+
+        chosen = np.arange(len(active)) * n_candidates + best
+        genomes[active[success]] = candidates[chosen[success]]
+        objectives[active[success]] = candidate_objectives[chosen[success]]
+
+        gains[active] = np.where(success, gain[np.arange(len(active)), best], 0)
+        steps[active] = np.where(success, steps[active] * 1.5, steps[active] / 2)
+
+    return genomes, objectives, evaluations
@@ -0,0 +1,101 @@
+"""
+Compact file format for a board definition and many layouts of it (populations, Pareto sets, seeds).
+
+File structure:
+    8 bytes   magic b"PCBLAYT1"
+    8 bytes   header length (little-endian uint64)
+    header    JSON: board definition (PCB.to_dict), number of layouts and components, presence of objectives
+    padding   up to a multiple of 64 bytes
+    poses     float64 array (n_layouts, n_components, 3) of [x, y, rotation], in the header component order
+    objectives  optional float64 array (n_layouts, 3)
+
+The arrays are loaded as memory-mapped views, so opening a file with thousands of layouts does not copy them.
+"""
+import json
+import struct
+import numpy as np
+
+from PCB_class import PCB
+from Genetic_algorithms import genomes_to_population
+
+MAGIC = b"PCBLAYT1"
+ALIGNMENT = 64
+DTYPE = np.dtype("<f8")
+
+
+def save_layouts(path: str, pcb_template: PCB, genomes: np.ndarray, objectives: np.ndarray = None):
+    """Write a board definition and its (n_layouts, n_components, 3) layouts (and optionally their objectives) to path"""
+    genomes = np.ascontiguousarray(genomes, dtype=DTYPE)
+    n_layouts, n_components, _ = genomes.shape
+
+    if n_components != len(pcb_template.components):
+        raise ValueError(f"Genomes have {n_components} components, the board has {len(pcb_template.components)}")
+
+    header = json.dumps({
+        "version": 1,
+        "board": pcb_template.to_dict(),
+        "n_layouts": n_layouts,
+        "n_components": n_components,
+        "has_objectives": objectives is not None
+    }).encode("utf-8")
+
+    data_offset = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        f.write(b"\0" * (data_offset - f.tell()))
+        f.write(genomes.tobytes())
+
+        if objectives is not None:
+            f.write(np.ascontiguousarray(objectives, dtype=DTYPE).reshape(n_layouts, 3).tobytes())
+
+
+def load_layouts(path: str, mmap: bool = True):
+    """
+    Read a file written by save_layouts and return (pcb_template, genomes, objectives).
+    With mmap the arrays are read-only views on the file, otherwise they are loaded in memory.
+    objectives is None if they were not saved.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a layout file")
+
+        (header_length,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_length).decode("utf-8"))
+
+    data_offset = -(-(len(MAGIC) + 8 + header_length) // ALIGNMENT) * ALIGNMENT
+    n_layouts, n_components = header["n_layouts"], header["n_components"]
+    n_values = n_layouts * n_components * 3 + (n_layouts * 3 if header["has_objectives"] else 0)
+
+    if n_values == 0:
+        data = np.empty(0, dtype=DTYPE)
+    elif mmap:
+        data = np.memmap(path, dtype=DTYPE, mode="r", offset=data_offset, shape=(n_values,))
+    else:
+        data = np.fromfile(path, dtype=DTYPE, count=n_values, offset=data_offset)
+
+    genomes = data[:n_layouts * n_components * 3].reshape(n_layouts, n_components, 3)
+    objectives = data[n_layouts * n_components * 3:].reshape(n_layouts, 3) if header["has_objectives"] else None
+
+    return PCB.from_dict(header["board"]), genomes, objectives
+
+
+def save_population(path: str, population: list, objectives: np.ndarray = None):
+    """Write a list of PCBs of the same board (e.g. a Pareto set) and optionally their objectives"""
+    genomes = np.stack([pcb.get_genome() for pcb in population])
+    save_layouts(path, population[0], genomes, objectives)
+
+
+def load_population(path: str):
+    """Read a file written by save_population (or save_layouts) and return (population, objectives)"""
+    pcb_template, genomes, objectives = load_layouts(path)
+    population = genomes_to_population(pcb_template, genomes)
+
+    # objectives saved with the layouts are reused instead of being evaluated again
+    if objectives is not None:
+        for pcb, obj in zip(population, objectives):
+            pcb.set_objectives(np.array(obj))
+
+    return population, objectives
@@ -1,14 +1,14 @@
 from PCB_class import PCB
+from Genetic_algorithms import generate_random_population_batch, generate_seeded_population, generate_offspring_batch, local_search_batch
 
+import time
 import numpy as np
 
+from bisect import bisect_left
+
 def evaluate_objectives(pcb: PCB):
-    """ Calculate the three fitness functions"""
-    max_temp, _ = pcb.calculate_max_temp()
-    occupied_area = pcb.calculate_occupied_area()
-    pin_distance = pcb.total_pin_distance()
-    
-    return np.array([max_temp,occupied_area, pin_distance])
+    """ Calculate the three fitness functions (cached on the PCB until its layout changes)"""
+    return pcb.objectives
 
 
 def dominates(objectives_a: np.ndarray, objectives_b: np.ndarray):
@@ -178,4 +178,221 @@ def calculate_crowding_distance_for_population(pop: list, pop_obj: np.ndarray, f
         for k, i in enumerate(front):
             distances[i] = cd[k]
 
-    return distances
\ No newline at end of file
+    return distances
+
+def non_dominated_mask(population_objectives: np.ndarray):
+    """
+    Vectorized check of the solutions not dominated by any other one (the first front, without building the others)
+    """
+    objs = np.asarray(population_objectives, dtype=float)
+
+    better_or_equal = np.all(objs[:, None, :] <= objs[None, :, :], axis=2)
+    strictly_better = np.any(objs[:, None, :] < objs[None, :, :], axis=2)
+
+    # dominated[j] is True if some i dominates j
+    dominated = np.any(better_or_equal & strictly_better, axis=0)
+
+    return ~dominated
+
+
+def hypervolume(population_objectives: np.ndarray, reference_point: np.ndarray):
+    """
+    Hypervolume of the region dominated by a set of 3-objective solutions and bounded by the reference point (minimization).
+    Algorithm (HV3D sweep):
+     1) Sort the points by the third objective
+     2) Insert them one by one into a 2D staircase of non-dominated (obj1, obj2) points, updating its area
+     3) Each slice between two consecutive values of the third objective contributes area * thickness
+    """
+    ref = np.asarray(reference_point, dtype=float)
+    points = np.asarray(population_objectives, dtype=float).reshape(-1, 3)
+
+    # only points strictly better than the reference point contribute
+    points = points[np.all(points < ref, axis=1)]
+    if len(points) == 0:
+        return 0.0
+
+    points = points[np.argsort(points[:, 2], kind="stable")]
+
+    xs, ys = [], []  # staircase, x ascending and y descending
+    area = 0.0
+    volume = 0.0
+
+    for k, (x, y, z) in enumerate(points):
+
+        i = bisect_left(xs, x)
+        dominated = (i > 0 and ys[i - 1] <= y) or (i < len(xs) and xs[i] == x and ys[i] <= y)
+
+        if not dominated:
+            # drop the staircase points the new one dominates
+            j = i
+            while j < len(xs) and ys[j] >= y:
+                j += 1
+            del xs[i:j], ys[i:j]
+            xs.insert(i, x)
+            ys.insert(i, y)
+
+            edges = np.append(xs, ref[0])
+            area = float(np.sum(np.diff(edges) * (ref[1] - np.asarray(ys))))
+
+        z_next = points[k + 1, 2] if k + 1 < len(points) else ref[2]
+        volume += area * (z_next - z)
+
+    return volume
+
+
+class HypervolumeArchive:
+    """
+    Archive of the non-dominated solutions found so far and of its hypervolume per generation,
+    used to stop the optimization when the improvement stalls over a window of generations.
+    """
+    def __init__(self, reference_point: np.ndarray = None, window: int = 10, tol: float = 1e-3):
+        # if not given, the reference point is set from the first population, 10% (of the worst value or of the range) worse than its worst values
+        self.reference_point = None if reference_point is None else np.asarray(reference_point, dtype=float)
+        self.window = window
+        self.tol = tol
+
+        self.points = np.empty((0, 3))
+        self.hypervolume = 0.0
+        self.history = []
+
+    def update(self, population_objectives: np.ndarray):
+        """Add a population to the archive and return the updated hypervolume"""
+        objs = np.asarray(population_objectives, dtype=float).reshape(-1, 3)
+
+        if self.reference_point is None:
+            worst = objs.max(axis=0)
+            offset = 0.1 * np.maximum(np.abs(worst), np.ptp(objs, axis=0))
+            # strictly positive offset, also for objectives that are always 0 (no heat sources, no links)
+            offset[offset == 0] = 1.0
+            self.reference_point = worst + offset
+
+        # incremental update: the hypervolume only changes if some new solution is not dominated by the archive
+        if len(self.points):
+            weakly_dominated = np.any(np.all(self.points[None, :, :] <= objs[:, None, :], axis=2), axis=1)
+            objs = objs[~weakly_dominated]
+
+        if len(objs):
+            merged = np.concatenate([self.points, objs])
+            self.points = merged[non_dominated_mask(merged)]
+            self.hypervolume = hypervolume(self.points, self.reference_point)
+
+        self.history.append(self.hypervolume)
+
+        return self.hypervolume
+
+    def has_converged(self):
+        """True if the relative hypervolume improvement over the last window generations is below tol"""
+        if len(self.history) <= self.window:
+            return False
+
+        # a hypervolume that never left 0 means the reference point is unusable, not that the search converged
+        if not any(self.history):
+            return False
+
+        previous = self.history[-1 - self.window]
+        improvement = self.history[-1] - previous
+
+        return improvement <= self.tol * max(abs(previous), np.finfo(float).eps)
+
+
+def memetic_refinement(pcb_template: PCB, population: list, population_objectives: list, budget: int = 1000, rng=None):
+    """
+    Refine the Pareto front of the population in place with local_search_batch and update its objectives.
+    Return the number of objective evaluations used by the local search.
+    """
+    fronts, _ = fast_non_dominated_sort(population_objectives, verbose=False)
+    front = fronts[0]
+
+    genomes = np.stack([population[i].get_genome() for i in front])
+    refined, _, evaluations = local_search_batch(pcb_template, genomes, budget=budget, rng=rng)
+
+    for k, i in enumerate(front):
+        if not np.array_equal(refined[k], genomes[k]):
+            population[i].set_genome(refined[k])
+            population_objectives[i] = evaluate_objectives(population[i])
+
+    return evaluations
+
+
+def run_nsga2(
+        pcb_template: PCB,
+        number_of_generations: int = 50,
+        population_size: int = 100,
+        n_cross: int = 1,
+        crossover_rate: float = 0.9,
+        rotation_mutation_rate: float = 0.1,
+        position_mutation_rate: float = 0.1,
+        sampling: str = "lhs",
+        convergence_window: int = 10,
+        convergence_tol: float = 1e-3,
+        reference_point: np.ndarray = None,
+        time_limit: float = None,
+        initial_population: list = None,
+        seed_layouts: list = None,
+        seeding: dict = None,
+        local_search_every: int = None,
+        local_search_budget: int = 1000,
+        rng=None,
+        verbose: bool = False):
+    """
+    Full NSGA-II loop without plots (main.py runs it and plots the results), stopped after number_of_generations,
+    when the hypervolume stalls or when time_limit seconds are exceeded (checked before each generation, so a run can
+    overshoot it by the duration of one generation, or of the initial population if that alone exceeds it).
+    reference_point is the hypervolume reference; fix it to compare hypervolumes across runs (by default it is set
+    from the first selected population, see HypervolumeArchive).
+    initial_population replaces the random initial population; alternatively seed_layouts (existing PCBs) are turned
+    into a population_size warm-start population by generate_seeded_population, with the keyword arguments in seeding.
+    With local_search_every = k, the Pareto front is refined by local_search_batch every k generations (memetic stage).
+    Return the final population, its objectives, the hypervolume archive and the stop reason.
+    """
+    rng = np.random.default_rng(rng)
+    start = time.monotonic()
+
+    archive = HypervolumeArchive(reference_point, window=convergence_window, tol=convergence_tol)
+    if initial_population is not None and seed_layouts is not None:
+        raise ValueError("Give either initial_population or seed_layouts, not both")
+
+    if seed_layouts is not None:
+        pop = generate_seeded_population(pcb_template, seed_layouts, population_size, rng=rng, **(seeding or {}))
+    elif initial_population is None:
+        pop = generate_random_population_batch(pcb_template, population_size, rng, sampling)
+    else:
+        # clones, so that the memetic refinement (in place) never modifies the caller's layouts
+        pop = [pcb.clone() for pcb in initial_population]
+    pop_objectives = [evaluate_objectives(pcb) for pcb in pop]
+    stop_reason = "max_generations"
+
+    for generation in range(number_of_generations):
+
+        # checked between generations (including right after the initial population), a generation is never interrupted
+        if time_limit is not None and time.monotonic() - start > time_limit:
+            stop_reason = "time_limit"
+            break
+
+        fronts, ranks = fast_non_dominated_sort(pop_objectives, verbose=False)
+        crowding = calculate_crowding_distance_for_population(pop, pop_objectives, fronts)
+
+        offspring = generate_offspring_batch(
+            pcb_template, pop, ranks, crowding, population_size,
+            n_cross=n_cross,
+            crossover_rate=crossover_rate,
+            rotation_mutation_rate=rotation_mutation_rate,
+            position_mutation_rate=position_mutation_rate,
+            rng=rng
+        )
+        offspring_objectives = [evaluate_objectives(pcb) for pcb in offspring]
+
+        pop, pop_objectives = nsga2_select(pop + offspring, pop_objectives + offspring_objectives, population_size)
+
+        if local_search_every and (generation + 1) % local_search_every == 0:
+            memetic_refinement(pcb_template, pop, pop_objectives, local_search_budget, rng)
+
+        hv = archive.update(pop_objectives)
+        if verbose:
+            print(f"Generation {generation}: hypervolume {hv:.4g}")
+
+        if archive.has_converged():
+            stop_reason = "converged"
+            break
+
+    return pop, pop_objectives, archive, stop_reason
@@ -12,6 +12,10 @@ from utils import hybrid_distance
 vec2D = Tuple[float, float]
 Link = Tuple[Pin, Pin]
 
+# weights of the Euclidean and Manhattan parts of the hybrid distance between linked pins
+PIN_DISTANCE_ALPHA = 0.3
+PIN_DISTANCE_BETA = 0.7
+
 class PCB:
     def __init__(self, max_width: float, max_height: float, components: List[Component], links: List[Link] = []):
         self.width = max_width
@@ -23,15 +27,76 @@ class PCB:
             ((c1, p1), (c2, p2))
             for ((c1, p1), (c2, p2)) in links
         ]
+
+        # cached objective vector, recomputed only when the layout changes
+        self._objectives = None
+        self._dirty = True
     
     def clone(self):
         """Return an object-clone of the PCB."""
-        return PCB(
+        new_pcb = PCB(
             max_width=self.width,
             max_height=self.height,
             components=[c.clone() for c in self.components.values()],
             links=[link for link in self.links]
         )
+
+        # same layout, so the cached objectives are still valid for the clone
+        if not self.is_dirty():
+            new_pcb._objectives = self._objectives
+            new_pcb._clear_dirty()
+
+        return new_pcb
+
+    def to_dict(self):
+        """Return the board definition (dimensions, component footprints, links) as a JSON-serializable dict."""
+        return {
+            "width": self.width,
+            "height": self.height,
+            "components": [c.to_dict() for c in self.components.values()],
+            "links": [[[c1, p1], [c2, p2]] for ((c1, p1), (c2, p2)) in self.links]
+        }
+
+    @staticmethod
+    def from_dict(d: dict):
+        """Build a PCB from a dict as returned by to_dict."""
+        return PCB(
+            max_width=d["width"],
+            max_height=d["height"],
+            components=[Component.from_dict(c) for c in d["components"]],
+            links=[((c1, p1), (c2, p2)) for ((c1, p1), (c2, p2)) in d.get("links", [])]
+        )
+
+    def set_objectives(self, objectives: np.ndarray):
+        """Set already known objectives of the current layout (e.g. loaded from file) to skip their evaluation."""
+        self._objectives = np.asarray(objectives, dtype=float)
+        self._clear_dirty()
+
+    def mark_dirty(self):
+        """Flag the layout as changed so the objectives are recomputed on next access."""
+        self._dirty = True
+
+    def is_dirty(self):
+        """Return True if the layout changed since the objectives were last computed."""
+        return self._dirty or any(c.dirty for c in self.components.values())
+
+    def _clear_dirty(self):
+        self._dirty = False
+        for c in self.components.values():
+            c.dirty = False
+
+    @property
+    def objectives(self):
+        """Objective vector [max_temp, occupied_area, pin_distance], computed lazily and cached until the layout changes."""
+        if self._objectives is None or self.is_dirty():
+            max_temp, _ = self.calculate_max_temp()
+            occupied_area = self.calculate_occupied_area()
+            pin_distance = self.total_pin_distance()
+
+            self._objectives = np.array([max_temp, occupied_area, pin_distance])
+            self._clear_dirty()
+
+        return self._objectives
     
     def random_placement(self):
         """Randomly place all components within the boundaries."""
@@ -43,6 +108,21 @@ class PCB:
             self.components[comp].move((x, y))
             self.components[comp].rotate(rand_angle)
 
+    def get_genome(self):
+        """Return the layout as a (n_components, 3) array of [x, y, rotation], in component order."""
+        return np.array([
+            [c.position[0], c.position[1], c.rotation]
+            for c in self.components.values()
+        ], dtype=float)
+
+    def set_genome(self, genome: np.ndarray):
+        """Place all components from a (n_components, 3) array of [x, y, rotation], in component order."""
+        for comp, (x, y, angle) in zip(self.components.values(), genome):
+            comp.position = (float(x), float(y))
+            comp.rotation = float(angle) % 360
+            comp.dirty = True
+            comp.update_absolute_pin_position()
+
     def get_pin(self, comp_id, pin_id):
         """Return the pin object given component and pin IDs."""
         comp = self.components[comp_id]
@@ -72,7 +152,7 @@ class PCB:
             pos2 = (pin2.absolute_x, pin2.absolute_y)
 
             # heuristics based on the busses layout of real PCBs (a weighted sum of Euclidean and Manhattan distances)
-            dist += hybrid_distance(pos1, pos2, alpha=0.3, beta=0.7)
+            dist += hybrid_distance(pos1, pos2, alpha=PIN_DISTANCE_ALPHA, beta=PIN_DISTANCE_BETA)
 
         return dist
     